@@ -1,43 +1,90 @@
 from __future__ import annotations
 
 import json
+import sys
 import time
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from app.logging import log_performance
 
 def _utcnow() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def _load_scenarios() -> List[Dict[str, Any]]:
+SCENARIO_PREFIX = "SCENARIO_"
+SCENARIO_RISKY_TYPES = frozenset(["active", "explore", "masochism", "submission", "fantasy_active"])
+SCENARIO_STOP_TYPES = frozenset(["boundary", "safety", "no"])
+BUCKET_ORDER = {"MISMATCH": 0, "TALK FIRST": 1, "EXPLORE": 2, "DOABLE NOW": 3}
+
+def _scenarios_path() -> str:
+    here = os.path.dirname(__file__)
+    return os.path.join(here, "templates", "scenarios.json")
+
+def _load_scenario_data() -> Dict[str, Any]:
     try:
-        here = os.path.dirname(__file__)
-        path = os.path.join(here, "templates", "scenarios.json")
+        path = _scenarios_path()
         if not os.path.exists(path):
-            return []
+            return {"decks": [], "scenarios": []}
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
             # Handle both list and dict formats
             if isinstance(data, list):
-                return data
+                return {"decks": [], "scenarios": data}
             elif isinstance(data, dict) and "scenarios" in data:
-                return data["scenarios"]
+                return {"decks": data.get("decks", []), "scenarios": data["scenarios"]}
             else:
-                return []
-    except (json.JSONDecodeError, IOError, OSError) as e:
-        # #region agent log
-        import json as _json; import time as _time; _log_data = {'location': 'core/compare.py:29', 'message': 'ERROR: exception in _load_scenarios', 'data': {'error_type': type(e).__name__, 'error_msg': str(e)}, 'timestamp': int(_time.time() * 1000), 'sessionId': 'debug-session', 'runId': 'post-fix', 'hypothesisId': 'D'}; _log_file = open('/home/d/Schreibtisch/gamex/.cursor/debug.log', 'a'); _log_file.write(_json.dumps(_log_data) + '\n'); _log_file.close()
-        # #endregion
-        return []
-    except Exception as e:
-        # #region agent log
-        import json as _json; import time as _time; _log_data = {'location': 'core/compare.py:33', 'message': 'ERROR: unexpected exception in _load_scenarios', 'data': {'error_type': type(e).__name__, 'error_msg': str(e)}, 'timestamp': int(_time.time() * 1000), 'sessionId': 'debug-session', 'runId': 'post-fix', 'hypothesisId': 'D'}; _log_file = open('/home/d/Schreibtisch/gamex/.cursor/debug.log', 'a'); _log_file.write(_json.dumps(_log_data) + '\n'); _log_file.close()
-        # #endregion
+                return {"decks": [], "scenarios": []}
+    except (json.JSONDecodeError, IOError, OSError):
+        return {"decks": [], "scenarios": []}
+    except Exception:
         # Re-raise unexpected exceptions to avoid hiding bugs
         raise
 
+def _load_scenarios() -> List[Dict[str, Any]]:
+    return _load_scenario_data()["scenarios"]
+
+def prepare_scenarios(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Baut den Szenario-Index einmalig auf:
+    - index: Szenario-ID -> (Position in der Datei, Szenario)
+    - keys: (SCENARIO_<id>, Szenario-ID) in Datei-Reihenfolge, zum direkten Nachschlagen in den Antworten
+    - deck_of: Szenario-ID -> Deck-ID
+    - decks: Decks sortiert nach "order"
+    - deck_meta: (id, name, order, requires_safety_gate) pro Deck für die Zusammenfassungen
+    """
+    index = {}
+    for pos, scen in enumerate(data.get("scenarios", [])):
+        index[scen["id"]] = (pos, scen)
+    keys = [(f"{SCENARIO_PREFIX}{sid}", sid) for sid, _ in sorted(index.items(), key=lambda kv: kv[1][0])]
+
+    decks = sorted(data.get("decks", []), key=lambda d: d.get("order", 0))
+    deck_of = {}
+    for deck in decks:
+        for sid in deck.get("scenarios", []):
+            deck_of.setdefault(sid, deck["id"])
+
+    deck_meta = [
+        (deck["id"], deck.get("name", ""), deck.get("order"), bool(deck.get("requires_safety_gate", False)))
+        for deck in decks
+    ]
+
+    return {"index": index, "keys": keys, "deck_of": deck_of, "decks": decks, "deck_meta": deck_meta}
+
+_prepared_scenarios_cache: Dict[str, Any] = {"key": None, "prepared": None}
+
+def _get_prepared_scenarios() -> Dict[str, Any]:
+    # Neu laden nur, wenn sich scenarios.json geändert hat
+    path = _scenarios_path()
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        key = (path, None)
+    if _prepared_scenarios_cache["key"] != key:
+        _prepared_scenarios_cache["prepared"] = prepare_scenarios(_load_scenario_data())
+        _prepared_scenarios_cache["key"] = key
+    return _prepared_scenarios_cache["prepared"]
+
 def normalize_answer(answer: Dict[str, Any]) -> Dict[str, Any]:
     """
     Normalisiert eine Antwort, um neue Felder mit Standardwerten zu füllen.
@@ -101,10 +148,35 @@ def normalize_answer(answer: Dict[str, Any]) -> Dict[str, Any]:
     
     return normalized
 
+# Enum-artige Antwortfelder: wenige verschiedene Werte, aber in jedem Ergebnis tausendfach vorhanden
+INTERNED_ANSWER_FIELDS = ("status", "dom_status", "sub_status", "active_status", "passive_status", "value", "choice", "risk_type")
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+def intern_result(value: Any) -> Any:
+    """
+    Interniert rekursiv alle Strings (Werte und Dict-Keys) eines Ergebnisses.
+    Gedacht für Ergebnisse, die aus Cache/DB per JSON geladen werden: Bucket-Namen, Status-Werte,
+    Tags, Modulnamen und Prompt-Texte liegen danach nur einmal im Speicher statt einmal pro Ergebnis.
+    Liefert eine neue Struktur; das Original bleibt unverändert.
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {_intern(k): intern_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [intern_result(v) for v in value]
+    return value
+
 def _get(resp: Dict[str, Any], qid: str) -> Dict[str, Any]:
     v = resp.get(qid)
     answer = v if isinstance(v, dict) else {}
-    return normalize_answer(answer)
+    normalized = normalize_answer(answer)
+    for field in INTERNED_ANSWER_FIELDS:
+        if type(normalized.get(field)) is str:
+            normalized[field] = sys.intern(normalized[field])
+    return normalized
 
 def _status_pair(a: str, b: str) -> str:
     # boundaries override everything
@@ -190,15 +262,9 @@ def _flag_low_comfort_high_interest(entry: Dict[str, Any]) -> bool:
         i = int(interest)
         c = int(comfort)
         return i >= 3 and c <= 2
-    except (ValueError, TypeError, KeyError) as e:
-        # #region agent log
-        import json as _json; import time as _time; _log_data = {'location': 'core/compare.py:187', 'message': 'ERROR: exception in _flag_low_comfort_high_interest', 'data': {'error_type': type(e).__name__, 'error_msg': str(e)}, 'timestamp': int(_time.time() * 1000), 'sessionId': 'debug-session', 'runId': 'post-fix', 'hypothesisId': 'D'}; _log_file = open('/home/d/Schreibtisch/gamex/.cursor/debug.log', 'a'); _log_file.write(_json.dumps(_log_data) + '\n'); _log_file.close()
-        # #endregion
+    except (ValueError, TypeError, KeyError):
         return False
-    except Exception as e:
-        # #region agent log
-        import json as _json; import time as _time; _log_data = {'location': 'core/compare.py:191', 'message': 'ERROR: unexpected exception in _flag_low_comfort_high_interest', 'data': {'error_type': type(e).__name__, 'error_msg': str(e)}, 'timestamp': int(_time.time() * 1000), 'sessionId': 'debug-session', 'runId': 'post-fix', 'hypothesisId': 'D'}; _log_file = open('/home/d/Schreibtisch/gamex/.cursor/debug.log', 'a'); _log_file.write(_json.dumps(_log_data) + '\n'); _log_file.close()
-        # #endregion
+    except Exception:
         # Re-raise unexpected exceptions to avoid hiding bugs
         raise
 
@@ -215,6 +281,58 @@ def _safe_int(v: Any) -> Optional[int]:
     except Exception:
         return None
 
+# Context-specific prompts based on tags (einmal pro Prozess statt pro Item)
+_TAG_PROMPTS = {
+    "warmup": [
+        "Eine gute Frage, um emotionale Nähe aufzubauen.",
+        "Nehmt euch Zeit für ehrliche Antworten - Nostalgie verbindet."
+    ],
+    "emotional": [
+        "Emotionale Themen brauchen einen sicheren Raum.",
+        "Hört einander zu ohne zu urteilen oder zu verteidigen."
+    ],
+    "conflict": [
+        "Konflikte sind normal - wie ihr damit umgeht, macht den Unterschied.",
+        "Sprecht über eure Deeskalations-Strategien."
+    ],
+    "love_languages": [
+        "Liebessprachen zu kennen hilft, sich geliebt zu fühlen.",
+        "Fragt nach: Wie kann ich dir besser zeigen, dass ich dich liebe?"
+    ],
+    "aftercare": [
+        "Aftercare ist nicht optional - es ist physiologisch notwendig.",
+        "Besprecht eure Bedürfnisse für danach, nicht nur für währenddessen."
+    ],
+    "breathplay": [
+        "⚠️ EXTREM HOHES RISIKO! Niemals allein, medizinisches Wissen erforderlich.",
+        "Nur mit non-verbalem Safeword (Klopfen). Niemals Kehlkopf."
+    ],
+    "bondage": [
+        "Schere bereit halten. Niemals allein lassen.",
+        "Auf Nervenbahnen achten - taube Finger = sofort lösen."
+    ],
+    "cnc": [
+        "CNC erfordert höchstes Vertrauen und ausführliche Vorbesprechung.",
+        "Safeword muss 100% respektiert werden, keine Ausnahmen."
+    ],
+    "digital": [
+        "Digitale Spuren sind dauerhaft - Privacy ernst nehmen.",
+        "Klärt, was mit Fotos/Videos passiert, bevor sie existieren."
+    ],
+    "future": [
+        "Große Entscheidungen brauchen Ehrlichkeit, keine Kompromisse aus Angst.",
+        "Inkompatibilität hier ist ok - besser jetzt wissen als später."
+    ],
+    "sensory": [
+        "Sensory Play erweitert Intimität über Genitalität hinaus.",
+        "Fragt nach: Welche Berührung möchtest du mehr spüren?"
+    ],
+    "children": [
+        "Kinderwunsch ist ein häufiger Deal-Breaker - Ehrlichkeit ist wichtiger als Hoffnung.",
+        "Wenn uneinig: Professionelle Paarberatung kann helfen."
+    ]
+}
+
 def _generate_conversation_prompts(item: Dict[str, Any]) -> List[str]:
     """
     Generiert 2-3 Gesprächs-Prompts für ein Item basierend auf Bucket, Flags, Tags und Bedingungen.
@@ -232,57 +350,6 @@ def _generate_conversation_prompts(item: Dict[str, Any]) -> List[str]:
     conditions_a = a.get("conditions", "").strip()
     conditions_b = b.get("conditions", "").strip()
     
-    # Context-specific prompts based on tags
-    tag_prompts = {
-        "warmup": [
-            "Eine gute Frage, um emotionale Nähe aufzubauen.",
-            "Nehmt euch Zeit für ehrliche Antworten - Nostalgie verbindet."
-        ],
-        "emotional": [
-            "Emotionale Themen brauchen einen sicheren Raum.",
-            "Hört einander zu ohne zu urteilen oder zu verteidigen."
-        ],
-        "conflict": [
-            "Konflikte sind normal - wie ihr damit umgeht, macht den Unterschied.",
-            "Sprecht über eure Deeskalations-Strategien."
-        ],
-        "love_languages": [
-            "Liebessprachen zu kennen hilft, sich geliebt zu fühlen.",
-            "Fragt nach: Wie kann ich dir besser zeigen, dass ich dich liebe?"
-        ],
-        "aftercare": [
-            "Aftercare ist nicht optional - es ist physiologisch notwendig.",
-            "Besprecht eure Bedürfnisse für danach, nicht nur für währenddessen."
-        ],
-        "breathplay": [
-            "⚠️ EXTREM HOHES RISIKO! Niemals allein, medizinisches Wissen erforderlich.",
-            "Nur mit non-verbalem Safeword (Klopfen). Niemals Kehlkopf."
-        ],
-        "bondage": [
-            "Schere bereit halten. Niemals allein lassen.",
-            "Auf Nervenbahnen achten - taube Finger = sofort lösen."
-        ],
-        "cnc": [
-            "CNC erfordert höchstes Vertrauen und ausführliche Vorbesprechung.",
-            "Safeword muss 100% respektiert werden, keine Ausnahmen."
-        ],
-        "digital": [
-            "Digitale Spuren sind dauerhaft - Privacy ernst nehmen.",
-            "Klärt, was mit Fotos/Videos passiert, bevor sie existieren."
-        ],
-        "future": [
-            "Große Entscheidungen brauchen Ehrlichkeit, keine Kompromisse aus Angst.",
-            "Inkompatibilität hier ist ok - besser jetzt wissen als später."
-        ],
-        "sensory": [
-            "Sensory Play erweitert Intimität über Genitalität hinaus.",
-            "Fragt nach: Welche Berührung möchtest du mehr spüren?"
-        ],
-        "children": [
-            "Kinderwunsch ist ein häufiger Deal-Breaker - Ehrlichkeit ist wichtiger als Hoffnung.",
-            "Wenn uneinig: Professionelle Paarberatung kann helfen."
-        ]
-    }
     
     if bucket == "DOABLE NOW":
         prompts.append(f"Beide möchtet ihr '{label}'. Perfekt für den Einstieg!")
@@ -349,7 +416,7 @@ def _generate_conversation_prompts(item: Dict[str, Any]) -> List[str]:
     
     # Add tag-specific prompts if we still have space
     if len(prompts) < 3:
-        for tag, tag_specific_prompts in tag_prompts.items():
+        for tag, tag_specific_prompts in _TAG_PROMPTS.items():
             if tag in tags:
                 # Pick a relevant prompt that hasn't been added yet
                 for tp in tag_specific_prompts:
@@ -365,7 +432,8 @@ def _generate_conversation_prompts(item: Dict[str, Any]) -> List[str]:
         if schema == "consent_rating":
             prompts.append("Kommuniziert offen über eure Bedürfnisse und Grenzen.")
     
-    return prompts[:3]  # Maximal 3 Prompts
+    # Gleiche Prompt-Texte (auch label-spezifische) über viele Ergebnisse hinweg nur einmal halten
+    return [sys.intern(p) for p in prompts[:3]]  # Maximal 3 Prompts
 
 def _generate_action_plan(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Filter for DOABLE NOW items of type consent_rating
@@ -450,266 +518,481 @@ def _generate_action_plan(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     return plan
 
-def compare(template: Dict[str, Any], resp_a: Dict[str, Any], resp_b: Dict[str, Any]) -> Dict[str, Any]:
-    start = time.time()
-    items: List[Dict[str, Any]] = []
-    summary = {
-        "counts": {"DOABLE NOW": 0, "EXPLORE": 0, "TALK FIRST": 0, "MISMATCH": 0},
-        "flags": {"low_comfort_high_interest": 0, "big_delta": 0, "high_risk": 0, "hard_limit_violation": 0},
-        "generated_at": _utcnow()
+# Ergebnis eines Schema-Handlers: (zusätzliche Row-Felder, pair_status, flags)
+SchemaOutcome = Tuple[Dict[str, Any], Optional[str], List[str]]
+AnswerPair = Tuple[Dict[str, Any], Dict[str, Any]]
+
+class SchemaHandler(NamedTuple):
+    """
+    Bewertung eines Schemas:
+    - row: bewertet ein einzelnes Antwortpaar
+    - batch: bewertet eine ganze Spalte von Antwortpaaren (gleiche Frage, viele Paare) in einem Durchlauf
+    """
+    row: Callable[[Dict[str, Any], Dict[str, Any]], SchemaOutcome]
+    batch: Callable[[List[AnswerPair]], List[SchemaOutcome]]
+
+SCHEMA_HANDLERS: Dict[str, SchemaHandler] = {}
+
+def _batch_from_row(row: Callable[[Dict[str, Any], Dict[str, Any]], SchemaOutcome]) -> Callable[[List[AnswerPair]], List[SchemaOutcome]]:
+    def batch(pairs: List[AnswerPair]) -> List[SchemaOutcome]:
+        return [row(a, b) for a, b in pairs]
+    return batch
+
+def register_schema(
+    name: str,
+    row: Callable[[Dict[str, Any], Dict[str, Any]], SchemaOutcome],
+    batch: Optional[Callable[[List[AnswerPair]], List[SchemaOutcome]]] = None
+) -> SchemaHandler:
+    """
+    Registriert (oder ersetzt) den Handler für ein Schema. Ohne batch wird row pro Paar aufgerufen.
+    Wirkt auf Templates, die danach mit prepare_template vorbereitet werden.
+    """
+    handler = SchemaHandler(row, batch or _batch_from_row(row))
+    SCHEMA_HANDLERS[name] = handler
+    return handler
+
+def _consent_variant(a: Dict[str, Any], b: Dict[str, Any], first: str, second: str) -> SchemaOutcome:
+    # Dom/Sub bzw. Aktiv/Passiv: beide Rollen getrennt bewerten, Gesamtstatus ist der ungünstigere
+    first_status = _status_pair(a.get(f"{first}_status") or "MAYBE", b.get(f"{first}_status") or "MAYBE")
+    second_status = _status_pair(a.get(f"{second}_status") or "MAYBE", b.get(f"{second}_status") or "MAYBE")
+
+    # Overall status is worst case
+    if first_status == "BOUNDARY" or second_status == "BOUNDARY":
+        pair_status = "BOUNDARY"
+    elif first_status == "MATCH" and second_status == "MATCH":
+        pair_status = "MATCH"
+    else:
+        pair_status = "EXPLORE"
+
+    delta_interest = max(
+        _abs_delta(_safe_int(a.get(f"{first}_interest")), _safe_int(b.get(f"{first}_interest"))) or 0,
+        _abs_delta(_safe_int(a.get(f"{second}_interest")), _safe_int(b.get(f"{second}_interest"))) or 0
+    )
+    delta_comfort = max(
+        _abs_delta(_safe_int(a.get(f"{first}_comfort")), _safe_int(b.get(f"{first}_comfort"))) or 0,
+        _abs_delta(_safe_int(a.get(f"{second}_comfort")), _safe_int(b.get(f"{second}_comfort"))) or 0
+    )
+
+    fields = {
+        "delta_interest": delta_interest,
+        "delta_comfort": delta_comfort,
+        f"{first}_status": first_status,
+        f"{second}_status": second_status,
     }
+    return fields, pair_status, []
 
-    modules = template.get("modules", [])
-    for mod in modules:
+def _consent_rating_row(a: Dict[str, Any], b: Dict[str, Any]) -> SchemaOutcome:
+    # Handle Dom/Sub variants
+    if a.get("dom_status") is not None or b.get("dom_status") is not None:
+        return _consent_variant(a, b, "dom", "sub")
+
+    # Handle active/passive variants
+    if a.get("active_status") is not None or b.get("active_status") is not None:
+        return _consent_variant(a, b, "active", "passive")
+
+    # Standard consent_rating
+    flags: List[str] = []
+    sa = a.get("status")
+    sb = b.get("status")
+    if sa and sb:
+        pair_status = _status_pair(sa, sb)
+    else:
+        pair_status = "EXPLORE"
+
+    # Check for Hard Limit Violations (One wants it, other has hard limit)
+    wants_it = ["YES", "MAYBE"]
+    if (sa == "HARD_LIMIT" and sb in wants_it) or (sb == "HARD_LIMIT" and sa in wants_it):
+        flags.append("hard_limit_violation")
+
+    delta_interest = _abs_delta(_safe_int(a.get("interest")), _safe_int(b.get("interest")))
+    delta_comfort = _abs_delta(_safe_int(a.get("comfort")), _safe_int(b.get("comfort")))
+
+    if _flag_low_comfort_high_interest(a) or _flag_low_comfort_high_interest(b):
+        flags.append("low_comfort_high_interest")
+
+    if (delta_interest is not None and delta_interest >= 3) or (delta_comfort is not None and delta_comfort >= 3):
+        flags.append("big_delta")
+
+    return {"delta_interest": delta_interest, "delta_comfort": delta_comfort}, pair_status, flags
+
+def _scale_row(a: Dict[str, Any], b: Dict[str, Any]) -> SchemaOutcome:
+    return _scale_batch([(a, b)])[0]
+
+def _scale_batch(pairs: List[AnswerPair]) -> List[SchemaOutcome]:
+    # Erst die ganze Spalte in Zahlen wandeln, dann nur noch Delta-Schwellen prüfen
+    values = [(_safe_int(a.get("value")), _safe_int(b.get("value"))) for a, b in pairs]
+    out: List[SchemaOutcome] = []
+    for va, vb in values:
+        if va is None or vb is None:
+            out.append(({"delta_value": None}, "EXPLORE", []))
+            continue
+        delta = abs(va - vb)
+        out.append(({"delta_value": delta}, "MATCH" if delta <= 1 else "EXPLORE", ["big_delta"] if delta >= 4 else []))
+    return out
+
+def _enum_row(a: Dict[str, Any], b: Dict[str, Any]) -> SchemaOutcome:
+    va = a.get("value")
+    vb = b.get("value")
+    match_value = (va == vb and va is not None)
+    return {"match_value": match_value}, "MATCH" if match_value else "EXPLORE", []
+
+def _multi_values(answer: Dict[str, Any]) -> List[Any]:
+    values = answer.get("values")
+    return values if isinstance(values, list) else []
+
+def _multi_row(a: Dict[str, Any], b: Dict[str, Any]) -> SchemaOutcome:
+    return _multi_batch([(a, b)])[0]
+
+def _multi_batch(pairs: List[AnswerPair]) -> List[SchemaOutcome]:
+    out: List[SchemaOutcome] = []
+    for a, b in pairs:
+        la = _multi_values(a)
+        lb = _multi_values(b)
+        # Leere Seite: Schnittmenge ist leer, ohne Sets zu bauen
+        inter = sorted(set(la).intersection(lb)) if la and lb else []
+        out.append(({"intersection": inter}, "MATCH" if inter else "EXPLORE", []))
+    return out
+
+def _unmatchable_row(a: Dict[str, Any], b: Dict[str, Any]) -> SchemaOutcome:
+    # not matchable automatically
+    return {}, "EXPLORE", []
+
+def _unmatchable_batch(pairs: List[AnswerPair]) -> List[SchemaOutcome]:
+    return [({}, "EXPLORE", []) for _ in pairs]
+
+register_schema("consent_rating", _consent_rating_row)
+register_schema("scale_1_10", _scale_row, _scale_batch)
+register_schema("enum", _enum_row)
+register_schema("multi", _multi_row, _multi_batch)
+register_schema("text", _unmatchable_row, _unmatchable_batch)
+
+# Unbekannte Schemas werden wie Freitext behandelt
+_FALLBACK_HANDLER = SchemaHandler(_unmatchable_row, _unmatchable_batch)
+
+def get_schema_handler(schema: Any) -> SchemaHandler:
+    # Kaputte Templates können hier Listen/Dicts liefern: die sind nicht hashbar und landen ebenfalls bei EXPLORE
+    if not isinstance(schema, str):
+        return _FALLBACK_HANDLER
+    return SCHEMA_HANDLERS.get(schema, _FALLBACK_HANDLER)
+
+def prepare_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bereitet ein Template einmalig für viele Vergleiche vor: löst pro Frage den Schema-Handler auf.
+    - questions: Liste von (module_id, module_name, question, handler) in Template-Reihenfolge
+    """
+    questions = []
+    for mod in template.get("modules", []):
         mod_id = mod.get("id", "")
         mod_name = mod.get("name", "")
         for q in mod.get("questions", []):
-            qid = q.get("id")
-            schema = q.get("schema")
-            risk = q.get("risk_level", "A")
-            label = q.get("label", "")
-            help_text = q.get("help", "")
-            tags = q.get("tags", [])
-
-            row: Dict[str, Any] = {
-                "question_id": qid,
-                "module_id": mod_id,
-                "module_name": mod_name,
-                "label": label,
-                "help": help_text,
-                "schema": schema,
-                "risk_level": risk,
-                "tags": tags,
-            }
-
-            a = _get(resp_a, qid)
-            b = _get(resp_b, qid)
-            row["a"] = a
-            row["b"] = b
-
-            flags: List[str] = []
-            pair_status = None
-
-            if schema == "consent_rating":
-                # Handle Dom/Sub variants
-                if a.get("dom_status") is not None or b.get("dom_status") is not None:
-                    # Dom/Sub variant logic
-                    dom_sa = a.get("dom_status")
-                    dom_sb = b.get("dom_status")
-                    sub_sa = a.get("sub_status")
-                    sub_sb = b.get("sub_status")
-                    
-                    dom_status = _status_pair(dom_sa or "MAYBE", dom_sb or "MAYBE")
-                    sub_status = _status_pair(sub_sa or "MAYBE", sub_sb or "MAYBE")
-                    
-                    # Overall status is worst case
-                    if dom_status == "BOUNDARY" or sub_status == "BOUNDARY":
-                        pair_status = "BOUNDARY"
-                    elif dom_status == "MATCH" and sub_status == "MATCH":
-                        pair_status = "MATCH"
-                    else:
-                        pair_status = "EXPLORE"
-                    
-                    # Calculate deltas for both
-                    dom_ia = _safe_int(a.get("dom_interest"))
-                    dom_ib = _safe_int(b.get("dom_interest"))
-                    dom_ca = _safe_int(a.get("dom_comfort"))
-                    dom_cb = _safe_int(b.get("dom_comfort"))
-                    sub_ia = _safe_int(a.get("sub_interest"))
-                    sub_ib = _safe_int(b.get("sub_interest"))
-                    sub_ca = _safe_int(a.get("sub_comfort"))
-                    sub_cb = _safe_int(b.get("sub_comfort"))
-                    
-                    row["delta_interest"] = max(_abs_delta(dom_ia, dom_ib) or 0, _abs_delta(sub_ia, sub_ib) or 0)
-                    row["delta_comfort"] = max(_abs_delta(dom_ca, dom_cb) or 0, _abs_delta(sub_ca, sub_cb) or 0)
-                    
-                    row["dom_status"] = dom_status
-                    row["sub_status"] = sub_status
-                
-                # Handle active/passive variants
-                elif a.get("active_status") is not None or b.get("active_status") is not None:
-                    # Active/Passive logic
-                    active_sa = a.get("active_status")
-                    active_sb = b.get("active_status")
-                    passive_sa = a.get("passive_status")
-                    passive_sb = b.get("passive_status")
-                    
-                    active_status = _status_pair(active_sa or "MAYBE", active_sb or "MAYBE")
-                    passive_status = _status_pair(passive_sa or "MAYBE", passive_sb or "MAYBE")
-                    
-                    # Overall status is worst case
-                    if active_status == "BOUNDARY" or passive_status == "BOUNDARY":
-                        pair_status = "BOUNDARY"
-                    elif active_status == "MATCH" and passive_status == "MATCH":
-                        pair_status = "MATCH"
-                    else:
-                        pair_status = "EXPLORE"
-                    
-                    # Calculate deltas for both
-                    active_ia = _safe_int(a.get("active_interest"))
-                    active_ib = _safe_int(b.get("active_interest"))
-                    active_ca = _safe_int(a.get("active_comfort"))
-                    active_cb = _safe_int(b.get("active_comfort"))
-                    passive_ia = _safe_int(a.get("passive_interest"))
-                    passive_ib = _safe_int(b.get("passive_interest"))
-                    passive_ca = _safe_int(a.get("passive_comfort"))
-                    passive_cb = _safe_int(b.get("passive_comfort"))
-                    
-                    row["delta_interest"] = max(_abs_delta(active_ia, active_ib) or 0, _abs_delta(passive_ia, passive_ib) or 0)
-                    row["delta_comfort"] = max(_abs_delta(active_ca, active_cb) or 0, _abs_delta(passive_ca, passive_cb) or 0)
-                    
-                    row["active_status"] = active_status
-                    row["passive_status"] = passive_status
-                
-                # Standard consent_rating
-                else:
-                    sa = a.get("status")
-                    sb = b.get("status")
-                    if sa and sb:
-                        pair_status = _status_pair(sa, sb)
-                    else:
-                        pair_status = "EXPLORE"
-
-                    # Check for Hard Limit Violations (One wants it, other has hard limit)
-                    wants_it = ["YES", "MAYBE"]
-                    if (sa == "HARD_LIMIT" and sb in wants_it) or (sb == "HARD_LIMIT" and sa in wants_it):
-                        flags.append("hard_limit_violation")
-                        summary["flags"]["hard_limit_violation"] += 1
-
-                    ia = _safe_int(a.get("interest"))
-                    ib = _safe_int(b.get("interest"))
-                    ca = _safe_int(a.get("comfort"))
-                    cb = _safe_int(b.get("comfort"))
-
-                    row["delta_interest"] = _abs_delta(ia, ib)
-                    row["delta_comfort"] = _abs_delta(ca, cb)
-
-                    if _flag_low_comfort_high_interest(a) or _flag_low_comfort_high_interest(b):
-                        flags.append("low_comfort_high_interest")
-                        summary["flags"]["low_comfort_high_interest"] += 1
-
-                    if (row["delta_interest"] is not None and row["delta_interest"] >= 3) or (row["delta_comfort"] is not None and row["delta_comfort"] >= 3):
-                        flags.append("big_delta")
-                        summary["flags"]["big_delta"] += 1
-
-            elif schema == "scale_1_10":
-                va = _safe_int(a.get("value"))
-                vb = _safe_int(b.get("value"))
-                row["delta_value"] = _abs_delta(va, vb)
-                pair_status = "MATCH" if (va is not None and vb is not None and row["delta_value"] <= 1) else "EXPLORE"
-                if row.get("delta_value") is not None and row["delta_value"] >= 4:
-                    flags.append("big_delta")
-                    summary["flags"]["big_delta"] += 1
-
-            elif schema == "enum":
-                va = a.get("value")
-                vb = b.get("value")
-                row["match_value"] = (va == vb and va is not None)
-                pair_status = "MATCH" if row["match_value"] else "EXPLORE"
-
-            elif schema == "multi":
-                la = a.get("values") if isinstance(a.get("values"), list) else []
-                lb = b.get("values") if isinstance(b.get("values"), list) else []
-                inter = sorted(list(set(la).intersection(set(lb))))
-                row["intersection"] = inter
-                pair_status = "MATCH" if len(inter) > 0 else "EXPLORE"
-
-            elif schema == "text":
-                # not matchable automatically
-                pair_status = "EXPLORE"
+            questions.append((mod_id, mod_name, q, get_schema_handler(q.get("schema"))))
+    return {"template": template, "questions": questions}
 
-            else:
-                pair_status = "EXPLORE"
+def _question_row(mod_id: str, mod_name: str, q: Dict[str, Any], a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "question_id": q.get("id"),
+        "module_id": mod_id,
+        "module_name": mod_name,
+        "label": q.get("label", ""),
+        "help": q.get("help", ""),
+        "schema": q.get("schema"),
+        "risk_level": q.get("risk_level", "A"),
+        "tags": q.get("tags", []),
+        "a": a,
+        "b": b,
+    }
 
-            if risk == "C":
-                flags.append("high_risk")
-                summary["flags"]["high_risk"] += 1
+def _finish_question_row(row: Dict[str, Any], outcome: SchemaOutcome) -> Dict[str, Any]:
+    fields, pair_status, flags = outcome
+    # Handler dürfen geteilte Flag-Listen zurückgeben, daher vor dem Anhängen kopieren
+    flags = list(flags)
+    row.update(fields)
+    risk = row["risk_level"]
 
-            row["pair_status"] = pair_status
-            
-            # Klassifiziere in neuen Bucket
-            bucket = _classify_bucket(pair_status, schema, a, b, risk)
-            row["bucket"] = bucket
-            
-            row["flags"] = flags
+    if risk == "C":
+        flags.append("high_risk")
+
+    row["pair_status"] = pair_status
+    
+    # Klassifiziere in neuen Bucket
+    row["bucket"] = _classify_bucket(pair_status, row["schema"], row["a"], row["b"], risk)
+    
+    row["flags"] = flags
+    
+    # Generiere Gesprächs-Prompts
+    row["conversationPrompts"] = _generate_conversation_prompts(row)
+
+    return row
+
+def _compare_question(
+    mod_id: str,
+    mod_name: str,
+    q: Dict[str, Any],
+    resp_a: Dict[str, Any],
+    resp_b: Dict[str, Any],
+    handler: Optional[SchemaHandler] = None
+) -> Dict[str, Any]:
+    """
+    Vergleicht eine einzelne Frage und liefert die fertige Ergebniszeile.
+    Die Summary-Zähler schreibt der Aufrufer anhand von row["flags"] und row["bucket"] fort,
+    damit einzelne Fragen (z.B. für Report-Diffs) isoliert neu bewertet werden können.
+    """
+    if handler is None:
+        handler = get_schema_handler(q.get("schema"))
+    qid = q.get("id")
+    a = _get(resp_a, qid)
+    b = _get(resp_b, qid)
+    row = _question_row(mod_id, mod_name, q, a, b)
+    return _finish_question_row(row, handler.row(a, b))
+
+def _compare_scenario(scen: Dict[str, Any], resp_a: Dict[str, Any], resp_b: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Vergleicht ein einzelnes Szenario. Liefert None, wenn keine der beiden Personen es beantwortet hat.
+    """
+    sid = scen["id"]
+    key = f"{SCENARIO_PREFIX}{sid}"
+    
+    sa = resp_a.get(key)
+    sb = resp_b.get(key)
+    
+    if not (sa or sb):
+        return None
+
+    a = sa if isinstance(sa, dict) else {}
+    b = sb if isinstance(sb, dict) else {}
+    choice_a = a.get("choice")
+    choice_b = b.get("choice")
+    
+    p_status = "EXPLORE"
+    if choice_a and choice_b:
+        if choice_a == choice_b:
+            p_status = "MATCH"
+        else:
+            # Nicht-String-Werte (kaputte Importe) zählen als unbekannter Typ
+            risk_a = a.get("risk_type") if isinstance(a.get("risk_type"), str) else None
+            risk_b = b.get("risk_type") if isinstance(b.get("risk_type"), str) else None
             
-            # Generiere Gesprächs-Prompts
-            row["conversationPrompts"] = _generate_conversation_prompts(row)
+            if (risk_a in SCENARIO_RISKY_TYPES and risk_b in SCENARIO_STOP_TYPES) or \
+               (risk_b in SCENARIO_RISKY_TYPES and risk_a in SCENARIO_STOP_TYPES):
+                p_status = "MISMATCH"
+    
+    # Klassifiziere Szenario in Bucket
+    scenario_bucket = _classify_bucket(p_status, "scenario", a, b, "B")
+    
+    return {
+        "question_id": sid,
+        "module_id": "scenarios",
+        "module_name": f"Szenario: {scen.get('category')}",
+        "label": scen.get("title"),
+        "help": scen.get("description"),
+        "schema": "scenario",
+        "risk_level": "B",
+        "tags": ["scenario"],
+        "a": sa,
+        "b": sb,
+        "pair_status": p_status,
+        "bucket": scenario_bucket,
+        "flags": ["scenario"],
+        "conversationPrompts": _generate_conversation_prompts({
+            "bucket": scenario_bucket,
+            "schema": "scenario",
+            "risk_level": "B",
+            "flags": ["scenario"],
+            "a": a,
+            "b": b,
+            "label": scen.get("title", "")
+        })
+    }
+
+def compare_scenarios(prepared: Dict[str, Any], resp_a: Dict[str, Any], resp_b: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Vergleicht nur die Szenarien, die in mindestens einer Antwort vorkommen (statt alle aus scenarios.json).
+    Liefert die Szenario-Items in Datei-Reihenfolge und im selben Durchlauf die Deck-Zusammenfassungen:
+    - counts/total pro Deck
+    - scenario_ids in Präsentations-Reihenfolge (MISMATCH zuerst, dann TALK FIRST, EXPLORE, DOABLE NOW)
+    """
+    index = prepared["index"]
+    keys = prepared["keys"]
+    deck_of = prepared["deck_of"]
+
+    # Echte Antworten haben deutlich mehr Keys als es Szenarien gibt: dann die bekannten
+    # SCENARIO_<id>-Keys direkt nachschlagen, nur bei sehr kleinen Antworten diese durchsuchen
+    if len(resp_a) + len(resp_b) < len(keys):
+        present = set()
+        for resp in (resp_a, resp_b):
+            for key in resp:
+                if isinstance(key, str) and key.startswith(SCENARIO_PREFIX):
+                    sid = key[len(SCENARIO_PREFIX):]
+                    if sid in index:
+                        present.add(sid)
+        present_ids = sorted(present, key=lambda s: index[s][0])
+    else:
+        present_ids = [sid for key, sid in keys if key in resp_a or key in resp_b]
+
+    items: List[Dict[str, Any]] = []
+    # Nur berührte Decks sammeln; die Zusammenfassungen entstehen am Ende aus den vorbereiteten Deck-Daten
+    deck_entries: Dict[str, List[Tuple[int, int, str, str]]] = {}
+    for sid in present_ids:
+        pos, scen = index[sid]
+        row = _compare_scenario(scen, resp_a, resp_b)
+        if row is None:
+            continue
+        items.append(row)
 
-            # Aktualisiere Counts mit neuem Bucket
-            if bucket in summary["counts"]:
-                summary["counts"][bucket] += 1
+        deck_id = deck_of.get(sid)
+        if deck_id is not None:
+            bucket = row["bucket"]
+            deck_entries.setdefault(deck_id, []).append((BUCKET_ORDER.get(bucket, 9), pos, sid, bucket))
+
+    deck_summaries: Dict[str, Any] = {}
+    for deck_id, name, order, requires_safety_gate in prepared["deck_meta"]:
+        counts = {"DOABLE NOW": 0, "EXPLORE": 0, "TALK FIRST": 0, "MISMATCH": 0}
+        entries = deck_entries.get(deck_id, [])
+        entries.sort()
+        for _, _, _, bucket in entries:
+            if bucket in counts:
+                counts[bucket] += 1
+        deck_summaries[deck_id] = {
+            "name": name,
+            "order": order,
+            "requires_safety_gate": requires_safety_gate,
+            "counts": counts,
+            "total": len(entries),
+            "scenario_ids": [sid for _, _, sid, _ in entries],
+        }
+
+    return items, deck_summaries
+
+def _new_summary() -> Dict[str, Any]:
+    return {
+        "counts": {"DOABLE NOW": 0, "EXPLORE": 0, "TALK FIRST": 0, "MISMATCH": 0},
+        "flags": {"low_comfort_high_interest": 0, "big_delta": 0, "high_risk": 0, "hard_limit_violation": 0},
+        "generated_at": _utcnow()
+    }
 
-            items.append(row)
+def _count_row(summary: Dict[str, Any], row: Dict[str, Any]) -> None:
+    # Flags eigener Schema-Handler, die die Summary nicht kennt, werden nicht gezählt
+    for flag in row["flags"]:
+        if flag in summary["flags"]:
+            summary["flags"][flag] += 1
 
+    # Aktualisiere Counts mit neuem Bucket
+    if row["bucket"] in summary["counts"]:
+        summary["counts"][row["bucket"]] += 1
+
+def compare(
+    template: Dict[str, Any],
+    resp_a: Dict[str, Any],
+    resp_b: Dict[str, Any],
+    on_phase: Optional[Callable[[str], None]] = None,
+    scenarios: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Vergleicht die Antworten zweier Personen für ein Template.
+    on_phase wird (falls gesetzt) nach jeder Phase mit deren Namen aufgerufen:
+    "questions", "scenarios", "sort", "action_plan", "summaries" (z.B. für memprofile).
+    scenarios ist ein per prepare_scenarios vorbereiteter Szenario-Index; ohne wird templates/scenarios.json genutzt.
+    """
+    return compare_prepared(prepare_template(template), resp_a, resp_b, on_phase, scenarios)
+
+def compare_prepared(
+    prepared: Dict[str, Any],
+    resp_a: Dict[str, Any],
+    resp_b: Dict[str, Any],
+    on_phase: Optional[Callable[[str], None]] = None,
+    scenarios: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Wie compare, aber mit einem per prepare_template vorbereiteten Template (für wiederholte Vergleiche)."""
+    start = time.time()
+    items: List[Dict[str, Any]] = []
+    summary = _new_summary()
+
+    for mod_id, mod_name, q, handler in prepared["questions"]:
+        row = _compare_question(mod_id, mod_name, q, resp_a, resp_b, handler)
+        _count_row(summary, row)
+        items.append(row)
+
+    if on_phase:
+        on_phase("questions")
+
+    result = _finish_result(prepared["template"], items, summary, resp_a, resp_b, scenarios, on_phase)
+
+    duration = (time.time() - start) * 1000
+    log_performance("compare_operation", duration,
+                   template_id=prepared["template"].get("id"),
+                   item_count=len(result["items"]))
+    return result
+
+def compare_batch(
+    prepared: Dict[str, Any],
+    pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    scenarios: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Vergleicht viele Antwortpaare gegen dasselbe vorbereitete Template.
+    Fragen werden spaltenweise bewertet: pro Frage ruft der Schema-Handler seinen Batch-Kernel
+    einmal für alle Paare auf. Die Ergebnisse sind identisch zu compare() pro Paar.
+    """
+    start = time.time()
+    summaries = [_new_summary() for _ in pairs]
+    item_lists: List[List[Dict[str, Any]]] = [[] for _ in pairs]
+
+    for mod_id, mod_name, q, handler in prepared["questions"]:
+        qid = q.get("id")
+        column = [(_get(resp_a, qid), _get(resp_b, qid)) for resp_a, resp_b in pairs]
+        outcomes = handler.batch(column)
+        for i, ((a, b), outcome) in enumerate(zip(column, outcomes)):
+            row = _finish_question_row(_question_row(mod_id, mod_name, q, a, b), outcome)
+            _count_row(summaries[i], row)
+            item_lists[i].append(row)
+
+    results = [
+        _finish_result(prepared["template"], item_lists[i], summaries[i], resp_a, resp_b, scenarios)
+        for i, (resp_a, resp_b) in enumerate(pairs)
+    ]
+
+    duration = (time.time() - start) * 1000
+    log_performance("compare_batch_operation", duration,
+                   template_id=prepared["template"].get("id"),
+                   pair_count=len(pairs))
+    return results
+
+def _finish_result(
+    template: Dict[str, Any],
+    items: List[Dict[str, Any]],
+    summary: Dict[str, Any],
+    resp_a: Dict[str, Any],
+    resp_b: Dict[str, Any],
+    scenarios: Optional[Dict[str, Any]] = None,
+    on_phase: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
     # 2. Compare Scenarios
-    scenarios = _load_scenarios()
-    for scen in scenarios:
-        sid = scen["id"]
-        key = f"SCENARIO_{sid}"
-        
-        sa = resp_a.get(key)
-        sb = resp_b.get(key)
-        
-        if sa or sb:
-            choice_a = sa.get("choice") if isinstance(sa, dict) else None
-            choice_b = sb.get("choice") if isinstance(sb, dict) else None
-            
-            p_status = "EXPLORE"
-            if choice_a and choice_b:
-                if choice_a == choice_b:
-                    p_status = "MATCH"
-                else:
-                    risk_a = sa.get("risk_type")
-                    risk_b = sb.get("risk_type")
-                    risky_types = ["active", "explore", "masochism", "submission", "fantasy_active"]
-                    stop_types = ["boundary", "safety", "no"]
-                    
-                    if (risk_a in risky_types and risk_b in stop_types) or \
-                       (risk_b in risky_types and risk_a in stop_types):
-                        p_status = "MISMATCH"
-            
-            # Klassifiziere Szenario in Bucket
-            scenario_bucket = _classify_bucket(p_status, "scenario", sa if isinstance(sa, dict) else {}, sb if isinstance(sb, dict) else {}, "B")
-            
-            if scenario_bucket in summary["counts"]:
-                summary["counts"][scenario_bucket] += 1
-                
-            items.append({
-                "question_id": sid,
-                "module_id": "scenarios",
-                "module_name": f"Szenario: {scen.get('category')}",
-                "label": scen.get("title"),
-                "help": scen.get("description"),
-                "schema": "scenario",
-                "risk_level": "B",
-                "tags": ["scenario"],
-                "a": sa,
-                "b": sb,
-                "pair_status": p_status,
-                "bucket": scenario_bucket,
-                "flags": ["scenario"],
-                "conversationPrompts": _generate_conversation_prompts({
-                    "bucket": scenario_bucket,
-                    "schema": "scenario",
-                    "risk_level": "B",
-                    "flags": ["scenario"],
-                    "a": sa,
-                    "b": sb,
-                    "label": scen.get("title", "")
-                })
-            })
+    if scenarios is None:
+        scenarios = _get_prepared_scenarios()
+    scenario_rows, deck_summaries = compare_scenarios(scenarios, resp_a, resp_b)
+    for row in scenario_rows:
+        if row["bucket"] in summary["counts"]:
+            summary["counts"][row["bucket"]] += 1
+        items.append(row)
+
+    if on_phase:
+        on_phase("scenarios")
 
     # Sort for presentation: mismatches first, then talk first, then explore, then doable now; high risk within groups
-    bucket_order = {"MISMATCH": 0, "TALK FIRST": 1, "EXPLORE": 2, "DOABLE NOW": 3}
     items.sort(key=lambda r: (
-        bucket_order.get(r.get("bucket", r.get("pair_status", "EXPLORE")), 9),
+        BUCKET_ORDER.get(r.get("bucket", r.get("pair_status", "EXPLORE")), 9),
         0 if r.get("risk_level") == "C" else 1,
         r.get("module_name", ""),
         r.get("question_id", "")
     ))
 
+    if on_phase:
+        on_phase("sort")
+
     action_plan = _generate_action_plan(items)
+
+    if on_phase:
+        on_phase("action_plan")
     
     # Generiere Kategorien-Zusammenfassungen (pro Modul)
     category_summaries = {}
@@ -745,11 +1028,9 @@ def compare(template: Dict[str, Any], resp_a: Dict[str, Any], resp_b: Dict[str,
             "total": len(scenario_items)
         }
 
-    duration = (time.time() - start) * 1000
-    log_performance("compare_operation", duration,
-                   template_id=template.get("id"),
-                   item_count=len(items))
-    
+    if on_phase:
+        on_phase("summaries")
+
     meta = {"template_id": template.get("id"), "template_name": template.get("name"), "template_version": template.get("version")}
     return {
         "meta": meta,
@@ -757,5 +1038,6 @@ def compare(template: Dict[str, Any], resp_a: Dict[str, Any], resp_b: Dict[str,
         "items": items,
         "action_plan": action_plan,
         "conversationPrompts": {},  # Für Rückwärtskompatibilität, wird pro Item gespeichert
-        "categorySummaries": category_summaries
+        "categorySummaries": category_summaries,
+        "deckSummaries": deck_summaries
     }
\ No newline at end of file
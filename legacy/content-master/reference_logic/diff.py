@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.compare import SCENARIO_PREFIX, _compare_question, _compare_scenario, _get_prepared_scenarios
+
+DELTA_FIELDS = ("delta_interest", "delta_comfort", "delta_value")
+
+ItemKey = Tuple[str, Any]
+
+
+def _item_key(item: Dict[str, Any]) -> ItemKey:
+    # Szenarien und Fragen teilen sich keinen ID-Raum, daher Modul + Frage als Schlüssel
+    return (item.get("module_id", ""), item.get("question_id"))
+
+
+def _bucket(item: Optional[Dict[str, Any]]) -> Optional[str]:
+    if item is None:
+        return None
+    return item.get("bucket", item.get("pair_status", "EXPLORE"))
+
+
+def _index_items(items: List[Dict[str, Any]]) -> Dict[ItemKey, Dict[str, Any]]:
+    return {_item_key(it): it for it in items}
+
+
+def _diff_pair(
+    old: Optional[Dict[str, Any]],
+    new: Optional[Dict[str, Any]],
+    report: Dict[str, Any]
+) -> None:
+    ref = new if new is not None else old
+    qid = ref.get("question_id")
+    mod_id = ref.get("module_id", "")
+
+    bucket_old = _bucket(old)
+    bucket_new = _bucket(new)
+    if bucket_old != bucket_new:
+        report["transitions"].append({
+            "question_id": qid,
+            "module_id": mod_id,
+            "label": ref.get("label", ""),
+            "from": bucket_old,
+            "to": bucket_new,
+        })
+        counts = report["module_counts"].setdefault(mod_id, {})
+        if bucket_old is not None:
+            counts[bucket_old] = counts.get(bucket_old, 0) - 1
+        if bucket_new is not None:
+            counts[bucket_new] = counts.get(bucket_new, 0) + 1
+
+    flags_old = old.get("flags", []) if old is not None else []
+    flags_new = new.get("flags", []) if new is not None else []
+    added = [f for f in flags_new if f not in flags_old]
+    removed = [f for f in flags_old if f not in flags_new]
+    if added or removed:
+        report["flag_changes"].append({
+            "question_id": qid,
+            "module_id": mod_id,
+            "added": added,
+            "removed": removed,
+        })
+
+    for field in DELTA_FIELDS:
+        d_old = old.get(field) if old is not None else None
+        d_new = new.get(field) if new is not None else None
+        if d_old == d_new:
+            continue
+        trend = None
+        if d_old is not None and d_new is not None:
+            trend = "shrank" if d_new < d_old else "grew"
+        report["delta_changes"].append({
+            "question_id": qid,
+            "module_id": mod_id,
+            "field": field,
+            "from": d_old,
+            "to": d_new,
+            "trend": trend,
+        })
+
+
+def _diff_items(old_items: List[Dict[str, Any]], new_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Gleicht zwei Item-Listen über einen question_id-Index ab (linear statt verschachtelter Schleife).
+    Items, die nur auf einer Seite existieren, gelten als Wechsel von/zu None.
+    """
+    report: Dict[str, Any] = {
+        "transitions": [],
+        "flag_changes": [],
+        "delta_changes": [],
+        "module_counts": {},
+    }
+
+    old_index = _index_items(old_items)
+    seen: Set[ItemKey] = set()
+    for new in new_items:
+        key = _item_key(new)
+        seen.add(key)
+        _diff_pair(old_index.get(key), new, report)
+    for key, old in old_index.items():
+        if key not in seen:
+            _diff_pair(old, None, report)
+
+    # Nur Module mit tatsächlicher Veränderung behalten
+    module_counts = {}
+    for mod_id, counts in report["module_counts"].items():
+        changed = {bucket: n for bucket, n in counts.items() if n != 0}
+        if changed:
+            module_counts[mod_id] = changed
+    report["module_counts"] = module_counts
+
+    new_hard_limits = sum(1 for fc in report["flag_changes"] if "hard_limit_violation" in fc["added"])
+    resolved_hard_limits = sum(1 for fc in report["flag_changes"] if "hard_limit_violation" in fc["removed"])
+    report["summary"] = {
+        "transitions": len(report["transitions"]),
+        "new_hard_limits": new_hard_limits,
+        "resolved_hard_limits": resolved_hard_limits,
+        "shrunk_deltas": sum(1 for dc in report["delta_changes"] if dc["trend"] == "shrank"),
+        "grown_deltas": sum(1 for dc in report["delta_changes"] if dc["trend"] == "grew"),
+    }
+    return report
+
+
+def diff_results(old_result: Dict[str, Any], new_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Vergleicht zwei fertige compare()-Ergebnisse desselben Paares (z.B. Erst- und Wiederholungsdurchlauf).
+
+    Liefert:
+    - transitions: Items, die den Bucket gewechselt haben
+    - flag_changes: hinzugekommene/weggefallene Flags (z.B. neue Hard Limits)
+    - delta_changes: veränderte Deltas inkl. Trend ("shrank"/"grew")
+    - module_counts: Bucket-Veränderung pro Modul
+    - summary: Kennzahlen über alle Änderungen
+    """
+    return _diff_items(old_result.get("items", []), new_result.get("items", []))
+
+
+def _changed_keys(before: Dict[str, Any], after: Dict[str, Any]) -> Set[str]:
+    return {k for k in set(before) | set(after) if before.get(k) != after.get(k)}
+
+
+def diff_snapshots(
+    template: Dict[str, Any],
+    before_a: Dict[str, Any],
+    before_b: Dict[str, Any],
+    after_a: Dict[str, Any],
+    after_b: Dict[str, Any],
+    scenarios: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Wie diff_results, aber direkt auf zwei Antwort-Snapshots desselben Paares.
+    Neu bewertet werden nur Fragen und Szenarien, deren Antworten sich bei A oder B geändert haben;
+    alle anderen Items sind in beiden Durchläufen identisch und tauchen im Diff nicht auf.
+    scenarios: Ergebnis von prepare_scenarios(); ohne Angabe die aktuelle scenarios.json.
+    """
+    changed = _changed_keys(before_a, after_a) | _changed_keys(before_b, after_b)
+
+    old_items: List[Dict[str, Any]] = []
+    new_items: List[Dict[str, Any]] = []
+    if not changed:
+        return _diff_items(old_items, new_items)
+
+    for mod in template.get("modules", []):
+        mod_id = mod.get("id", "")
+        mod_name = mod.get("name", "")
+        for q in mod.get("questions", []):
+            if q.get("id") not in changed:
+                continue
+            old_items.append(_compare_question(mod_id, mod_name, q, before_a, before_b))
+            new_items.append(_compare_question(mod_id, mod_name, q, after_a, after_b))
+
+    prepared = scenarios if scenarios is not None else _get_prepared_scenarios()
+    scenario_index = prepared["index"]
+    changed_scenarios = [
+        k[len(SCENARIO_PREFIX):] for k in changed
+        if k.startswith(SCENARIO_PREFIX) and k[len(SCENARIO_PREFIX):] in scenario_index
+    ]
+    for sid in sorted(changed_scenarios, key=lambda s: scenario_index[s][0]):
+        scen = scenario_index[sid][1]
+        old = _compare_scenario(scen, before_a, before_b)
+        new = _compare_scenario(scen, after_a, after_b)
+        if old is not None:
+            old_items.append(old)
+        if new is not None:
+            new_items.append(new)
+
+    return _diff_items(old_items, new_items)
@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.compare import compare, compare_batch, prepare_scenarios, prepare_template
+from app.core.diff import diff_results, diff_snapshots
+
+# Engines werden als engine(template, resp_a, resp_b, scenarios=<prepare_scenarios(...)>) aufgerufen
+Engine = Callable[..., Dict[str, Any]]
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+CORPUS_PATH = os.path.join(GOLDEN_DIR, "corpus.json")
+EXPECTED_PATH = os.path.join(GOLDEN_DIR, "expected.json")
+
+CORPUS_VERSION = 1
+DEFAULT_SEED = 20240601
+
+# Echte Templates, die zusätzlich mit Zufallsantworten abgedeckt werden
+REAL_TEMPLATES = ["default_template.json", "unified_template.json", "psycho_enhanced_v3.json"]
+
+STATUSES = ["YES", "MAYBE", "NO", "HARD_LIMIT"]
+SCORES: List[Any] = [0, 1, 2, 3, 4, 5, None, "4", "x"]
+
+
+def _synthetic_template() -> Dict[str, Any]:
+    """
+    Kleines Template, das jedes Schema, jede Variante und alle Tag-/Risiko-Zweige der Prompt-Logik abdeckt.
+    """
+    def cr(qid: str, risk: str, tags: List[str], **extra: Any) -> Dict[str, Any]:
+        q = {"id": qid, "schema": "consent_rating", "risk_level": risk, "label": f"Frage {qid}", "help": "", "tags": tags}
+        q.update(extra)
+        return q
+
+    return {
+        "id": "golden_synthetic",
+        "name": "Golden Synthetic",
+        "version": CORPUS_VERSION,
+        "modules": [
+            {
+                "id": "consent",
+                "name": "Consent",
+                "questions": [
+                    cr("C_SOFT", "A", ["kissing", "warmup"]),
+                    cr("C_TOY", "A", ["toy", "sensory"]),
+                    cr("C_KINK", "B", ["bdsm", "aftercare"]),
+                    cr("C_IMPACT", "B", ["impact", "bondage"]),
+                    cr("C_EMO", "A", ["emotional", "conflict"]),
+                    cr("C_FUTURE", "A", ["future", "children"]),
+                    cr("C_BREATH", "C", ["breathplay", "breath"]),
+                    cr("C_BLOOD", "C", ["blood", "needles"]),
+                    cr("C_CNC", "C", ["cnc", "digital"]),
+                    cr("C_PLAIN", "B", []),
+                    cr("C_LOVE", "A", ["love_languages"]),
+                ],
+            },
+            {
+                "id": "variants",
+                "name": "Varianten",
+                "questions": [
+                    cr("V_DOMSUB", "B", ["bdsm"], has_dom_sub=True),
+                    cr("V_ACTPAS", "A", ["touching"], has_active_passive=True),
+                ],
+            },
+            {
+                "id": "other",
+                "name": "Sonstiges",
+                "questions": [
+                    {"id": "O_SCALE", "schema": "scale_1_10", "risk_level": "A", "label": "Skala", "tags": []},
+                    {"id": "O_ENUM", "schema": "enum", "risk_level": "A", "label": "Auswahl", "options": ["a", "b", "c"], "tags": ["future"]},
+                    {"id": "O_MULTI", "schema": "multi", "risk_level": "B", "label": "Mehrfach", "options": ["x", "y", "z"], "tags": []},
+                    {"id": "O_TEXT", "schema": "text", "risk_level": "A", "label": "Freitext", "tags": ["emotional"]},
+                    {"id": "O_UNKNOWN", "schema": "slider_legacy", "risk_level": "C", "label": "Unbekannt", "tags": []},
+                ],
+            },
+        ],
+    }
+
+
+def _edge_cases(scenarios: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """Handverlesene Grenzfälle für das synthetische Template."""
+    cases: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = [
+        ("empty", {}, {}),
+        ("missing_status", {"C_PLAIN": {"interest": 4, "comfort": 1}}, {"C_PLAIN": {"status": "YES", "interest": 4, "comfort": 4}}),
+        ("invalid_intensity", {"C_PLAIN": {"status": "YES", "intensity": "stark"}}, {"C_PLAIN": {"status": "YES", "intensity": 9}}),
+        ("intensity_below_range", {"C_PLAIN": {"status": "YES", "intensity": 0}}, {"C_PLAIN": {"status": "YES", "intensity": None}}),
+        ("invalid_confidence", {"C_PLAIN": {"status": "MAYBE", "confidence": "x"}}, {"C_PLAIN": {"status": "MAYBE", "confidence": 9}}),
+        ("hard_limit_vs_maybe", {"C_KINK": {"status": "HARD_LIMIT"}}, {"C_KINK": {"status": "MAYBE", "interest": 3, "comfort": 2}}),
+        ("hard_limit_vs_yes", {"C_SOFT": {"status": "YES", "interest": 5, "comfort": 5}}, {"C_SOFT": {"status": "HARD_LIMIT"}}),
+        ("no_vs_yes", {"C_TOY": {"status": "NO"}}, {"C_TOY": {"status": "YES"}}),
+        ("explicit_hard_no", {"C_PLAIN": {"status": "YES", "hardNo": True}}, {"C_PLAIN": {"status": "YES", "hardNo": False}}),
+        ("context_flags_not_list", {"C_PLAIN": {"status": "YES", "contextFlags": "public"}}, {"C_PLAIN": {"status": "YES", "contextFlags": ["public"]}}),
+        ("maybe_with_conditions", {"C_KINK": {"status": "MAYBE", "conditions": " nur mit Safeword "}}, {"C_KINK": {"status": "YES", "conditions": "langsam"}}),
+        ("both_yes_high_comfort", {"C_SOFT": {"status": "YES", "interest": 5, "comfort": 4}}, {"C_SOFT": {"status": "YES", "interest": 4, "comfort": 5}}),
+        ("both_yes_high_risk", {"C_BREATH": {"status": "YES", "comfort": 5}}, {"C_BREATH": {"status": "YES", "comfort": 5}}),
+        ("big_delta", {"C_PLAIN": {"status": "YES", "interest": 5, "comfort": 5}}, {"C_PLAIN": {"status": "YES", "interest": 1, "comfort": 2}}),
+        ("answer_not_dict", {"C_PLAIN": "YES", "O_SCALE": 7}, {"C_PLAIN": None, "O_SCALE": [7]}),
+        ("dom_sub_one_sided", {"V_DOMSUB": {"dom_status": "YES", "dom_interest": 5}}, {"V_DOMSUB": {"sub_status": "YES", "sub_interest": 1}}),
+        ("dom_sub_hard_limit", {"V_DOMSUB": {"dom_status": "HARD_LIMIT", "sub_status": "YES"}}, {"V_DOMSUB": {"dom_status": "YES", "sub_status": "YES"}}),
+        ("dom_sub_match", {"V_DOMSUB": {"dom_status": "YES", "sub_status": "YES", "dom_comfort": 4}}, {"V_DOMSUB": {"dom_status": "YES", "sub_status": "YES", "dom_comfort": 1}}),
+        ("active_passive_match", {"V_ACTPAS": {"active_status": "YES", "passive_status": "YES"}}, {"V_ACTPAS": {"active_status": "YES", "passive_status": "YES"}}),
+        ("active_passive_missing", {"V_ACTPAS": {"active_status": "NO"}}, {"V_ACTPAS": {}}),
+        ("scale_close", {"O_SCALE": {"value": 7}}, {"O_SCALE": {"value": "8"}}),
+        ("scale_far", {"O_SCALE": {"value": 1}}, {"O_SCALE": {"value": 10}}),
+        ("scale_invalid", {"O_SCALE": {"value": "viel"}}, {"O_SCALE": {"value": 3}}),
+        ("enum_match", {"O_ENUM": {"value": "b"}}, {"O_ENUM": {"value": "b"}}),
+        ("enum_both_none", {"O_ENUM": {"value": None}}, {"O_ENUM": {}}),
+        ("multi_overlap", {"O_MULTI": {"values": ["z", "x"]}}, {"O_MULTI": {"values": ["x", "z", "y"]}}),
+        ("multi_not_list", {"O_MULTI": {"values": "x"}}, {"O_MULTI": {"values": ["x"]}}),
+        ("text_and_unknown", {"O_TEXT": {"text": "a"}, "O_UNKNOWN": {"value": 1}}, {"O_TEXT": {"text": "a"}, "O_UNKNOWN": {"value": 1}}),
+    ]
+
+    # Szenarien: gleiche Wahl, riskant vs. Stopp, sonstige Kombinationen pro Risiko-Typ
+    by_type: Dict[str, Tuple[str, str]] = {}
+    for scen in scenarios:
+        for opt in scen.get("options", []):
+            by_type.setdefault(opt.get("risk_type"), (scen["id"], opt["id"]))
+    for risk_type, (sid, choice) in sorted(by_type.items(), key=lambda kv: str(kv[0])):
+        answer = {"choice": choice, "risk_type": risk_type}
+        cases.append((f"scenario_same_{risk_type}", {f"SCENARIO_{sid}": answer}, {f"SCENARIO_{sid}": dict(answer)}))
+    if scenarios:
+        key = f"SCENARIO_{scenarios[0]['id']}"
+        opt = scenarios[0]["options"][0]
+        cases.append(("scenario_one_sided", {key: {"choice": opt["id"], "risk_type": opt["risk_type"]}}, {}))
+        cases.append(("scenario_not_dict", {key: opt["id"]}, {key: {"choice": opt["id"], "risk_type": opt["risk_type"]}}))
+        cases.append(("scenario_unknown_id", {"SCENARIO_UNKNOWN": {"choice": "A"}}, {"SCENARIO_UNKNOWN": {"choice": "B"}}))
+    seen_pairs = set()
+    for scen in scenarios:
+        key = f"SCENARIO_{scen['id']}"
+        types = {opt.get("risk_type"): opt["id"] for opt in scen.get("options", [])}
+        for type_a in sorted(types, key=str):
+            for type_b in sorted(types, key=str):
+                if type_a == type_b or (type_a, type_b) in seen_pairs:
+                    continue
+                # Nur Paare mit Stopp-Seite sind für MISMATCH relevant
+                if type_b not in ("boundary", "safety", "no"):
+                    continue
+                seen_pairs.add((type_a, type_b))
+                a = {key: {"choice": types[type_a], "risk_type": type_a}}
+                b = {key: {"choice": types[type_b], "risk_type": type_b}}
+                cases.append((f"scenario_{type_a}_vs_{type_b}", a, b))
+                if type_a in ("active", "explore", "masochism", "submission", "fantasy_active"):
+                    cases.append((f"scenario_{type_b}_vs_{type_a}", b, a))
+    return cases
+
+
+def _random_answer(q: Dict[str, Any], rng: random.Random) -> Any:
+    schema = q.get("schema")
+    roll = rng.random()
+    if roll < 0.1:
+        return None
+    if roll < 0.13:
+        return rng.choice(["YES", 3, []])
+    if schema == "consent_rating":
+        if q.get("has_dom_sub") and rng.random() < 0.7:
+            return {
+                "dom_status": rng.choice(STATUSES + [None]),
+                "sub_status": rng.choice(STATUSES + [None]),
+                "dom_interest": rng.choice(SCORES),
+                "dom_comfort": rng.choice(SCORES),
+                "sub_interest": rng.choice(SCORES),
+                "sub_comfort": rng.choice(SCORES),
+            }
+        if q.get("has_active_passive") and rng.random() < 0.7:
+            return {
+                "active_status": rng.choice(STATUSES + [None]),
+                "passive_status": rng.choice(STATUSES + [None]),
+                "active_interest": rng.choice(SCORES),
+                "active_comfort": rng.choice(SCORES),
+                "passive_interest": rng.choice(SCORES),
+                "passive_comfort": rng.choice(SCORES),
+            }
+        answer: Dict[str, Any] = {"status": rng.choice(STATUSES + [None, ""]), "interest": rng.choice(SCORES), "comfort": rng.choice(SCORES)}
+        if rng.random() < 0.3:
+            answer["conditions"] = rng.choice(["", "  ", "nur mit Safeword", "erst reden"])
+        if rng.random() < 0.3:
+            answer["intensity"] = rng.choice([0, 1, 3, 5, 9, "x", None])
+        if rng.random() < 0.1:
+            answer["confidence"] = rng.choice([0, 3, 9, "x"])
+        return answer
+    if schema == "scale_1_10":
+        return {"value": rng.choice([1, 2, 5, 6, 9, 10, None, "7", "x"])}
+    if schema == "enum":
+        options = list(q.get("options") or ["a", "b"])
+        return {"value": rng.choice(options[:3] + [None])}
+    if schema == "multi":
+        options = list(q.get("options") or ["x", "y", "z"])
+        return {"values": rng.sample(options[:5], rng.randint(0, min(3, len(options[:5]))))}
+    return {"text": "frei"}
+
+
+def _random_responses(
+    template: Dict[str, Any],
+    scenarios: List[Dict[str, Any]],
+    scenario_ids: List[str],
+    rng: random.Random
+) -> Dict[str, Any]:
+    resp: Dict[str, Any] = {}
+    for mod in template.get("modules", []):
+        for q in mod.get("questions", []):
+            answer = _random_answer(q, rng)
+            if answer is not None:
+                resp[q["id"]] = answer
+    for scen in scenarios:
+        if scen["id"] in scenario_ids:
+            opt = rng.choice(scen["options"])
+            resp[f"SCENARIO_{scen['id']}"] = {"choice": opt["id"], "risk_type": opt["risk_type"]}
+    return resp
+
+
+def generate_corpus(seed: int = DEFAULT_SEED, random_cases: int = 24) -> Dict[str, Any]:
+    """
+    Erzeugt den Golden-Corpus: Templates und Szenarien/Decks (inline, damit der TS-Port offline prüfen kann)
+    sowie Antwortpaare. Deterministisch für einen gegebenen Seed.
+    Fehlt ein Quell-Template oder scenarios.json, bricht die Erzeugung ab statt einen kleineren Corpus zu schreiben.
+    """
+    rng = random.Random(seed)
+    here = os.path.dirname(__file__)
+    raw_scenarios = _read_source(os.path.join(here, "templates", "scenarios.json"))
+    # Gleiche Formate wie _load_scenario_data (Liste oder {"decks", "scenarios"})
+    if isinstance(raw_scenarios, list):
+        scenario_data = {"decks": [], "scenarios": raw_scenarios}
+    elif isinstance(raw_scenarios, dict):
+        scenario_data = {"decks": raw_scenarios.get("decks", []), "scenarios": raw_scenarios.get("scenarios", [])}
+    else:
+        scenario_data = {"decks": [], "scenarios": []}
+    if not scenario_data["scenarios"]:
+        raise ValueError("scenarios.json enthält keine Szenarien")
+    scenarios = scenario_data["scenarios"]
+    templates: Dict[str, Dict[str, Any]] = {"synthetic": _synthetic_template()}
+    for name in REAL_TEMPLATES:
+        templates[name] = _read_source(os.path.join(here, "templates", name))
+
+    cases: List[Dict[str, Any]] = []
+    for case_id, a, b in _edge_cases(scenarios):
+        cases.append({"id": case_id, "template": "synthetic", "a": a, "b": b})
+
+    for i in range(random_cases):
+        # Szenarien werden immer von beiden beantwortet, damit die Paare vergleichbar bleiben
+        scenario_ids = [s["id"] for s in scenarios if rng.random() < 0.15]
+        a = _random_responses(templates["synthetic"], scenarios, scenario_ids, rng)
+        b = _random_responses(templates["synthetic"], scenarios, scenario_ids, rng)
+        cases.append({"id": f"random_synthetic_{i:03d}", "template": "synthetic", "a": a, "b": b})
+
+    for name in REAL_TEMPLATES:
+        scenario_ids = [s["id"] for s in scenarios if rng.random() < 0.2]
+        a = _random_responses(templates[name], scenarios, scenario_ids, rng)
+        b = _random_responses(templates[name], scenarios, scenario_ids, rng)
+        cases.append({"id": f"random_{os.path.splitext(name)[0]}", "template": name, "a": a, "b": b})
+
+    return {"version": CORPUS_VERSION, "seed": seed, "templates": templates, "scenarios": scenario_data, "cases": cases}
+
+
+def _read_source(path: str) -> Any:
+    # Bewusst ohne Fallback: fehlende Quellen sollen "generate" abbrechen
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Quelle für Golden-Corpus fehlt: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bringt ein Ergebnis in eine vergleichbare Form: JSON-Roundtrip, ohne Zeitstempel.
+    """
+    normalized = json.loads(json.dumps(result, ensure_ascii=False))
+    normalized.get("summary", {}).pop("generated_at", None)
+    return normalized
+
+
+def _first_difference(expected: Any, actual: Any, path: str = "$") -> Optional[str]:
+    if type(expected) is not type(actual):
+        return path
+    if isinstance(expected, dict):
+        for key in sorted(set(expected) | set(actual), key=str):
+            if key not in expected or key not in actual:
+                return f"{path}.{key}"
+            diff = _first_difference(expected[key], actual[key], f"{path}.{key}")
+            if diff:
+                return diff
+        return None
+    if isinstance(expected, list):
+        if len(expected) != len(actual):
+            return f"{path}[len]"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            diff = _first_difference(e, a, f"{path}[{i}]")
+            if diff:
+                return diff
+        return None
+    return None if expected == actual else path
+
+
+def build_expected(corpus: Dict[str, Any], engine: Engine = compare) -> Dict[str, Any]:
+    """Berechnet die erwarteten (normalisierten) Ergebnisse aller Fälle mit der Referenz-Engine."""
+    templates = corpus["templates"]
+    scenarios = prepare_scenarios(corpus["scenarios"])
+    outputs = {}
+    for case in corpus["cases"]:
+        output = engine(templates[case["template"]], case["a"], case["b"], scenarios=scenarios)
+        outputs[case["id"]] = normalize_result(output)
+    return {"version": corpus["version"], "seed": corpus.get("seed"), "results": outputs}
+
+
+def run_harness(
+    corpus: Dict[str, Any],
+    engines: Dict[str, Engine],
+    expected: Optional[Dict[str, Any]] = None,
+    repeat: int = 1
+) -> Dict[str, Any]:
+    """
+    Spielt den Corpus durch alle Engines und vergleicht gegen die erwarteten Ergebnisse.
+    Ohne expected wird die Referenz (compare) live ausgewertet.
+
+    Pro Engine:
+    - mismatches: Fall-ID -> erster abweichender JSON-Pfad (oder Fehlertext)
+    - cases_per_second: Durchsatz über alle Fälle und Wiederholungen
+    """
+    if expected is None:
+        expected = build_expected(corpus)
+    results = expected["results"]
+    templates = corpus["templates"]
+    scenarios = prepare_scenarios(corpus["scenarios"])
+
+    report: Dict[str, Any] = {}
+    for name, engine in engines.items():
+        mismatches: Dict[str, str] = {}
+        elapsed = 0.0
+        runs = 0
+        for case in corpus["cases"]:
+            template = templates[case["template"]]
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                try:
+                    output = engine(template, case["a"], case["b"], scenarios=scenarios)
+                except Exception as e:
+                    mismatches[case["id"]] = f"{type(e).__name__}: {e}"
+                    break
+                elapsed += time.perf_counter() - t0
+                runs += 1
+            else:
+                diff = _first_difference(results.get(case["id"]), normalize_result(output))
+                if diff:
+                    mismatches[case["id"]] = diff
+        report[name] = {
+            "cases": len(corpus["cases"]),
+            "mismatches": mismatches,
+            "ok": not mismatches,
+            "seconds": elapsed,
+            "cases_per_second": (runs / elapsed) if elapsed > 0 else None,
+        }
+    return report
+
+
+def run_batch_harness(corpus: Dict[str, Any], expected: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Prüft compare_batch: alle Fälle eines Templates laufen als ein Batch durch die Batch-Kernel der Schema-Handler.
+    Liefert dieselbe Report-Struktur wie run_harness.
+    """
+    if expected is None:
+        expected = build_expected(corpus)
+    results = expected["results"]
+    scenarios = prepare_scenarios(corpus["scenarios"])
+
+    by_template: Dict[str, List[Dict[str, Any]]] = {}
+    for case in corpus["cases"]:
+        by_template.setdefault(case["template"], []).append(case)
+
+    mismatches: Dict[str, str] = {}
+    elapsed = 0.0
+    for name, cases in by_template.items():
+        t0 = time.perf_counter()
+        pairs = [(c["a"], c["b"]) for c in cases]
+        outputs = compare_batch(prepare_template(corpus["templates"][name]), pairs, scenarios)
+        elapsed += time.perf_counter() - t0
+        for case, output in zip(cases, outputs):
+            diff = _first_difference(results.get(case["id"]), normalize_result(output))
+            if diff:
+                mismatches[case["id"]] = diff
+
+    return {
+        "batch": {
+            "cases": len(corpus["cases"]),
+            "mismatches": mismatches,
+            "ok": not mismatches,
+            "seconds": elapsed,
+            "cases_per_second": (len(corpus["cases"]) / elapsed) if elapsed > 0 else None,
+        }
+    }
+
+
+def _sorted_diff(report: Dict[str, Any]) -> Dict[str, Any]:
+    # diff_snapshots arbeitet in Template-Reihenfolge, diff_results in Ergebnis-Reihenfolge: Listen ohne Reihenfolge vergleichen
+    return {
+        key: sorted(value, key=lambda entry: json.dumps(entry, sort_keys=True)) if isinstance(value, list) else value
+        for key, value in report.items()
+    }
+
+
+def run_diff_harness(corpus: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prüft diff_snapshots gegen diff_results(compare(...), compare(...)).
+    Verglichen werden jeweils benachbarte Fälle desselben Templates (vorher = Fall i, nachher = Fall i+1).
+    Liefert dieselbe Report-Struktur wie run_harness, Fall-IDs als "vorher->nachher".
+    """
+    scenarios = prepare_scenarios(corpus["scenarios"])
+
+    by_template: Dict[str, List[Dict[str, Any]]] = {}
+    for case in corpus["cases"]:
+        by_template.setdefault(case["template"], []).append(case)
+
+    mismatches: Dict[str, str] = {}
+    elapsed = 0.0
+    checked = 0
+    for name, cases in by_template.items():
+        template = corpus["templates"][name]
+        for before, after in zip(cases, cases[1:]):
+            pair_id = f"{before['id']}->{after['id']}"
+            checked += 1
+            try:
+                full = diff_results(
+                    compare(template, before["a"], before["b"], scenarios=scenarios),
+                    compare(template, after["a"], after["b"], scenarios=scenarios),
+                )
+                t0 = time.perf_counter()
+                fast = diff_snapshots(template, before["a"], before["b"], after["a"], after["b"], scenarios=scenarios)
+                elapsed += time.perf_counter() - t0
+            except Exception as e:
+                mismatches[pair_id] = f"{type(e).__name__}: {e}"
+                continue
+            diff = _first_difference(_sorted_diff(full), _sorted_diff(fast))
+            if diff:
+                mismatches[pair_id] = diff
+
+    return {
+        "diff": {
+            "cases": checked,
+            "mismatches": mismatches,
+            "ok": not mismatches,
+            "seconds": elapsed,
+            "cases_per_second": (checked / elapsed) if elapsed > 0 else None,
+        }
+    }
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def load_golden() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    with open(EXPECTED_PATH, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    return corpus, expected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Golden-Corpus für die Vergleichslogik erzeugen bzw. prüfen")
+    parser.add_argument("command", choices=["generate", "check"])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        corpus = generate_corpus(args.seed)
+        _write_json(CORPUS_PATH, corpus)
+        _write_json(EXPECTED_PATH, build_expected(corpus))
+        print(f"{len(corpus['cases'])} Fälle geschrieben nach {GOLDEN_DIR}")
+        return 0
+
+    corpus, expected = load_golden()
+    report = run_harness(corpus, {"reference": compare}, expected, repeat=args.repeat)
+    report.update(run_batch_harness(corpus, expected))
+    report.update(run_diff_harness(corpus))
+    for name, entry in report.items():
+        passed = entry["cases"] - len(entry["mismatches"])
+        rate = entry["cases_per_second"] or 0.0
+        print(f"{name}: {passed}/{entry['cases']} ok, {rate:.0f} Fälle/s")
+        for case_id, diff in sorted(entry["mismatches"].items()):
+            print(f"  {case_id}: {diff}")
+    return 0 if all(entry["ok"] for entry in report.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
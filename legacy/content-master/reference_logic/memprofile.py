@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.compare import _get_prepared_scenarios, compare, intern_result
+
+
+def _start_tracing() -> bool:
+    # Läuft tracemalloc schon (z.B. von außen gestartet), lassen wir es am Ende auch laufen
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start()
+    return True
+
+
+def profile_compare(template: Dict[str, Any], resp_a: Dict[str, Any], resp_b: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Misst den Speicher von compare() pro Phase mit tracemalloc.
+
+    Pro Phase:
+    - peak_bytes: Spitze während der Phase, relativ zum Stand vor compare()
+    - retained_bytes: nach der Phase noch belegter Speicher, relativ zum Stand vor compare()
+
+    Zusätzlich peak_bytes/retained_bytes für den gesamten Aufruf (retained = das fertige Ergebnis).
+    """
+    started = _start_tracing()
+    try:
+        # Szenario-Cache vorher füllen, sonst landet das einmalige Laden von scenarios.json in der ersten Messung
+        _get_prepared_scenarios()
+        gc.collect()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        phases: List[Dict[str, Any]] = []
+        overall_peak = 0
+
+        def on_phase(name: str) -> None:
+            nonlocal overall_peak
+            current, peak = tracemalloc.get_traced_memory()
+            overall_peak = max(overall_peak, peak - base)
+            phases.append({"phase": name, "peak_bytes": peak - base, "retained_bytes": current - base})
+            tracemalloc.reset_peak()
+
+        result = compare(template, resp_a, resp_b, on_phase=on_phase)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        overall_peak = max(overall_peak, peak - base)
+        report = {"phases": phases, "peak_bytes": overall_peak, "retained_bytes": current - base}
+        del result
+        return report
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def measure_retained(factory: Callable[[], Any]) -> int:
+    """Bytes, die das von factory erzeugte Objekt belegt, solange es lebt (inkl. Zwischenstrukturen, die es hält)."""
+    started = _start_tracing()
+    try:
+        gc.collect()
+        base, _ = tracemalloc.get_traced_memory()
+        obj = factory()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        del obj
+        return current - base
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def interning_savings(
+    template: Dict[str, Any],
+    pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    copies: int = 1
+) -> Dict[str, Any]:
+    """
+    Vergleicht den Speicher vieler gecachter Ergebnisse mit und ohne Interning.
+    Simuliert Cache/DB: jedes Ergebnis wird per JSON serialisiert und wieder geladen (copies-mal pro Paar).
+    """
+    payloads = [json.dumps(compare(template, a, b), ensure_ascii=False) for a, b in pairs]
+
+    def load_raw() -> List[Dict[str, Any]]:
+        return [json.loads(p) for p in payloads for _ in range(copies)]
+
+    def load_interned() -> List[Dict[str, Any]]:
+        return [intern_result(json.loads(p)) for p in payloads for _ in range(copies)]
+
+    raw = measure_retained(load_raw)
+    interned = measure_retained(load_interned)
+    return {
+        "results": len(payloads) * copies,
+        "raw_bytes": raw,
+        "interned_bytes": interned,
+        "saved_bytes": raw - interned,
+        "saved_ratio": (raw - interned) / raw if raw else 0.0,
+    }
+
+
+def _format_bytes(n: int) -> str:
+    return f"{n / 1024:.1f} KiB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.core.golden import load_golden
+
+    parser = argparse.ArgumentParser(description="Speicherprofil der Vergleichslogik anhand des Golden-Corpus")
+    parser.add_argument("--copies", type=int, default=20, help="Kopien pro Ergebnis für die Cache-Simulation")
+    args = parser.parse_args(argv)
+
+    corpus, _ = load_golden()
+    by_template: Dict[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]] = {}
+    for case in corpus["cases"]:
+        by_template.setdefault(case["template"], []).append((case["a"], case["b"]))
+
+    for name, pairs in sorted(by_template.items()):
+        template = corpus["templates"][name]
+        a, b = pairs[-1]
+        profile = profile_compare(template, a, b)
+        print(f"{name}: peak {_format_bytes(profile['peak_bytes'])}, Ergebnis {_format_bytes(profile['retained_bytes'])}")
+        for phase in profile["phases"]:
+            print(f"  {phase['phase']:<12} peak {_format_bytes(phase['peak_bytes']):>12}  retained {_format_bytes(phase['retained_bytes']):>12}")
+        savings = interning_savings(template, pairs, copies=args.copies)
+        print(f"  {savings['results']} gecachte Ergebnisse: {_format_bytes(savings['raw_bytes'])} -> "
+              f"{_format_bytes(savings['interned_bytes'])} ({savings['saved_ratio']:.0%} gespart)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())